@@ -9,7 +9,9 @@ Logic:
      Focusmate session (>=50m that started at/before 09:15 local).
   3) Persist SoT rows only for qualifying days (value=1) and drop any others
      from the local DB.
-  4) Reconcile Beeminder 'wakeandfocus' per day:
+  4) Reconcile Beeminder 'wakeandfocus' per day (skipped if the same SoT was
+     already reconciled within the last 24h and no wakeandfocus dp was
+     updated since; deletions are only caught by the next full pass):
        - If none: POST (idempotent via requestid) **with daystamp**.
        - If multiple: keep newest, delete extras.
        - Ensure value & comment match SoT; PUT update (with daystamp) if needed.
@@ -27,14 +29,19 @@ Env:
 
 import os
 import re
+import hashlib
+import json
 import sys
 import sqlite3
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, date, timedelta, timezone
 from zoneinfo import ZoneInfo
 from pathlib import Path
-from collections import defaultdict
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache, partial
+from typing import Callable, Iterable, Iterator, Optional
 
 # -------- Config from env --------
 USERNAME = os.getenv("BM_USERNAME", "zarathustra")
@@ -49,23 +56,61 @@ FOCUSMATE_GOAL = "focusmate"
 WAKEANDFOCUS_GOAL = "wakeandfocus"
 
 LOCAL_TZ = ZoneInfo("America/New_York")
+UTC = timezone.utc
 MIN_SESSION_MINUTES = 24
 EARLIEST_HOUR = 5
 EARLIEST_MINUTE = 45
 CUTOFF_HOUR = 9
 CUTOFF_MINUTE = 15  # inclusive
 
+# Minutes-after-midnight (h*60+m) of every start time in the window
+QUALIFIES = frozenset(
+    h * 60 + m
+    for h in range(24)
+    for m in range(60)
+    if (h > EARLIEST_HOUR or (h == EARLIEST_HOUR and m >= EARLIEST_MINUTE))
+    and (h < CUTOFF_HOUR or (h == CUTOFF_HOUR and m <= CUTOFF_MINUTE))
+)
+
 COMMENT_RE = re.compile(
     r"^\s*(\d+)\s*minutes?\s+session\s+at\s+(\d{1,2}):(\d{2})\b",
     re.IGNORECASE,
 )
+_re_search = COMMENT_RE.search
 
 API_BASE = "https://www.beeminder.com/api/v1"
+RECONCILE_WORKERS = 8
+PREFETCH_PAGES = 4
+
+# -------- HTTP session --------
+# One keep-alive session for every Beeminder call so TCP/TLS setup is paid
+# once per run instead of once per request.
+SESSION = requests.Session()
+SESSION.headers["Connection"] = "keep-alive"
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            # Every POST carries a requestid, so retrying it is idempotent
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"POST"},
+            raise_on_status=False,  # let raise_for_status() below report the body
+        ),
+    ),
+)
 
 # -------- SoT storage --------
 DATA_DIR = Path("data")
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 DB_PATH = DATA_DIR / "wake_focus_sot.db"
+# The focusmate datapoint cache lives next to the DB as <goal>_cache.json.
+# Deletions don't show up in an updated_since fetch, so re-download
+# everything once a cache's last full sync is this old.
+DP_CACHE_MAX_AGE = timedelta(days=7)
 
 CREATE_SOT_SQL = """
 CREATE TABLE IF NOT EXISTS records (
@@ -85,16 +130,87 @@ ON CONFLICT(daystamp) DO UPDATE SET
 
 SELECT_ALL_SOT_SQL = "SELECT daystamp, value FROM records;"
 
+CREATE_META_SQL = """
+CREATE TABLE IF NOT EXISTS meta (
+  key TEXT PRIMARY KEY,
+  value TEXT
+);
+"""
+
+UPSERT_META_SQL = """
+INSERT INTO meta(key, value)
+VALUES (?, ?)
+ON CONFLICT(key) DO UPDATE SET
+  value=excluded.value;
+"""
+
+# Skip reconciliation when the SoT is unchanged and was reconciled this recently
+RECONCILE_MAX_AGE = timedelta(hours=24)
+
 # -------- Helpers --------
 def log_debug(msg: str):
     if DEBUG:
         print(f"[DEBUG] {msg}")
 
+def date_to_daystamp(d: date) -> str:
+    """YYYYMMDD via integer formatting (cheaper than strftime)."""
+    return f"{d.year:04d}{d.month:02d}{d.day:02d}"
+
 def daystamp_of(dt: datetime, tz: ZoneInfo) -> str:
-    return dt.astimezone(tz).strftime("%Y%m%d")
+    return date_to_daystamp(dt.astimezone(tz))
+
+@lru_cache(maxsize=None)
+def _daystamp_of_hour(utc_hour: int) -> str:
+    return daystamp_of(datetime.fromtimestamp(utc_hour * 3600, tz=UTC), LOCAL_TZ)
+
+def _daystamp_of_ts(ts: int) -> str:
+    """Local daystamp for a unix timestamp.
+
+    LOCAL_TZ's offsets are whole hours, so local midnight always falls on a
+    UTC hour boundary and every timestamp in the same UTC hour shares a
+    daystamp; the tz conversion is memoized per hour.
+    """
+    return _daystamp_of_hour(ts // 3600)
+
+def _dp_daystamp(dp: dict) -> Optional[str]:
+    """Local daystamp of a dp, derived from its timestamp when missing."""
+    ds = dp.get("daystamp")
+    if not ds:
+        ts = dp.get("timestamp")
+        if ts is None:
+            return None
+        ds = _daystamp_of_ts(int(ts))
+    return ds
+
+def _bucket_by_daystamp(dps: list[dict], days: Iterable[str] = ()) -> dict[str, list[dict]]:
+    """Group dps by local daystamp, starting with an empty bucket per day in
+    `days` (the days expected to have dps)."""
+    by_day: dict[str, list[dict]] = {ds: [] for ds in days}
+    for dp in dps:
+        ds = _dp_daystamp(dp)
+        if ds is not None:
+            by_day.setdefault(ds, []).append(dp)
+    return by_day
+
+def _dedupe_by_id(dps: list[dict]) -> list[dict]:
+    """Drop repeated dps (same id), keeping the first; id-less dps are kept."""
+    seen: set = set()
+    out: list[dict] = []
+    for dp in dps:
+        dp_id = dp.get("id")
+        if dp_id:
+            if dp_id in seen:
+                continue
+            seen.add(dp_id)
+        out.append(dp)
+    return out
 
 def parse_comment_for_length_and_time(comment: Optional[str]):
-    m = COMMENT_RE.search(comment or "")
+    # Cheap reject before the regex: a match must start with a digit
+    # (after optional whitespace)
+    if not comment or not comment.lstrip()[:1].isdigit():
+        return None
+    m = _re_search(comment)
     if not m:
         return None
     minutes = int(m.group(1))
@@ -105,66 +221,118 @@ def parse_comment_for_length_and_time(comment: Optional[str]):
     return minutes, hour, minute
 
 def qualifies_time(hour: int, minute: int) -> bool:
-    return (
-        (hour > EARLIEST_HOUR or (hour == EARLIEST_HOUR and minute >= EARLIEST_MINUTE))
-        and ((hour < CUTOFF_HOUR) or (hour == CUTOFF_HOUR and minute <= CUTOFF_MINUTE))
-    )
+    return hour * 60 + minute in QUALIFIES
 
 def now_iso_utc() -> str:
-    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+@lru_cache(maxsize=4096)
+def _iso_to_epoch(u: str) -> Optional[float]:
+    try:
+        # Beeminder tends to use ISO8601 with Z (parsed natively on 3.11+)
+        return datetime.fromisoformat(u).timestamp()
+    except ValueError:
+        return None
 
 def _dp_updated_key(dp: dict) -> float:
     """Robust sort key for 'newest' dp."""
     u = dp.get("updated_at")
     if isinstance(u, str):
-        try:
-            # Beeminder tends to use ISO8601 with Z
-            return datetime.fromisoformat(u.replace("Z", "+00:00")).timestamp()
-        except Exception:
-            pass
+        parsed = _iso_to_epoch(u)
+        if parsed is not None:
+            return parsed
     t = dp.get("timestamp")
     if isinstance(t, (int, float)):
         return float(t)
     return 0.0
 
 # -------- API helpers (with pagination) --------
+# Full datapoint downloads for this run, keyed by (username, goal). Any
+# mutation of a goal drops its entry.
+_dp_cache: dict[tuple[str, str], list[dict]] = {}
+
 def _need_auth():
     if not AUTH_TOKEN and not DRY_RUN:
         raise RuntimeError("BM_AUTH_TOKEN is not set")
 
-def fetch_all_datapoints(username: str, goal: str) -> list[dict]:
-    """Return *all* datapoints for a goal (paginated)."""
+def _fetch_page(
+    username: str, goal: str, page: int, per_page: int, since: Optional[int] = None
+) -> tuple[int, list[dict]]:
+    url = f"{API_BASE}/users/{username}/goals/{goal}/datapoints.json"
+    params = {"auth_token": AUTH_TOKEN, "sort": "desc", "page": page, "per_page": per_page}
+    if since is not None:
+        params["updated_since"] = since
+    log_debug(f"GET {url} page={page}")
+    resp = SESSION.get(url, params=params, timeout=30)
+    try:
+        resp.raise_for_status()
+    except requests.HTTPError as e:
+        raise RuntimeError(f"GET {goal} page {page} -> {resp.status_code}: {resp.text}") from e
+    return page, resp.json()
+
+def iter_all_datapoints(username: str, goal: str, since: Optional[int] = None) -> Iterator[dict]:
+    """Yield a goal's datapoints page by page, newest first.
+
+    Page 1 is fetched on its own, since it is often the only page. After a
+    full page, the following pages are requested PREFETCH_PAGES at a time;
+    everything after the first short page in a window is discarded. Fetches
+    with `since` stay strictly serial, as they rarely span more than a page.
+    Only the current window is held in memory.
+    """
+    per_page = 25
+    _, batch = _fetch_page(username, goal, 1, per_page, since)
+    yield from batch
+    if len(batch) < per_page:
+        return
+
+    page = 2
+    if since is not None:
+        while True:
+            _, batch = _fetch_page(username, goal, page, per_page, since)
+            yield from batch
+            if len(batch) < per_page:
+                return
+            page += 1
+
+    with ThreadPoolExecutor(max_workers=PREFETCH_PAGES) as pool:
+        while True:
+            window = [
+                pool.submit(_fetch_page, username, goal, p, per_page, since)
+                for p in range(page, page + PREFETCH_PAGES)
+            ]
+            for fut in window:
+                _, batch = fut.result()
+                yield from batch
+                if len(batch) < per_page:
+                    return
+            page += PREFETCH_PAGES
+
+def fetch_all_datapoints(username: str, goal: str, since: Optional[int] = None) -> list[dict]:
+    """Return *all* datapoints for a goal, or only those updated at/after
+    unix time `since`.
+
+    Full downloads are kept in _dp_cache for the rest of the run.
+    """
     _need_auth()
     if DRY_RUN:
         log_debug(f"[DRY_RUN] Would fetch all datapoints for {goal}")
         return []
+    key = (username, goal)
+    if since is None and key in _dp_cache:
+        log_debug(f"Using in-process cache for {goal}")
+        return _dp_cache[key]
 
-    results = []
-    page = 1
-    per_page = 25
-    while True:
-        url = f"{API_BASE}/users/{username}/goals/{goal}/datapoints.json"
-        params = {"auth_token": AUTH_TOKEN, "sort": "desc", "page": page, "per_page": per_page}
-        log_debug(f"GET {url} page={page}")
-        resp = requests.get(url, params=params, timeout=30)
-        try:
-            resp.raise_for_status()
-        except requests.HTTPError as e:
-            raise RuntimeError(f"GET {goal} page {page} -> {resp.status_code}: {resp.text}") from e
-        batch = resp.json()
-        if not batch:
-            break
-        results.extend(batch)
-        if len(batch) < per_page:
-            break
-        page += 1
+    results = list(iter_all_datapoints(username, goal, since))
     log_debug(f"Fetched {len(results)} datapoints for {goal}")
+    if since is None:
+        _dp_cache[key] = results
     return results
 
 def add_datapoint(goal: str, value: float, comment: str, *, daystamp: str, requestid: str | None = None):
     if DRY_RUN:
         log_debug(f"[DRY_RUN] Would POST {goal}: value={value}, comment={comment}, daystamp={daystamp}, requestid={requestid}")
         return {}
+    _dp_cache.pop((USERNAME, goal), None)
     url = f"{API_BASE}/users/{USERNAME}/goals/{goal}/datapoints.json"
     data = {
         "auth_token": AUTH_TOKEN,
@@ -174,7 +342,7 @@ def add_datapoint(goal: str, value: float, comment: str, *, daystamp: str, reque
     }
     if requestid:
         data["requestid"] = requestid
-    resp = requests.post(url, data=data, timeout=30)
+    resp = SESSION.post(url, data=data, timeout=30)
     # Beeminder returns 422 "Duplicate request" if the same requestid is
     # submitted multiple times. That is normal if we race with another run of
     # this script. Treat that specific error as success so the script remains
@@ -195,11 +363,12 @@ def update_datapoint(goal: str, dp_id: str, value: float, comment: str, *, dayst
     if DRY_RUN:
         log_debug(f"[DRY_RUN] Would PUT {goal} dp_id={dp_id}: value={value}, comment={comment}, daystamp={daystamp}")
         return {}
+    _dp_cache.pop((USERNAME, goal), None)
     url = f"{API_BASE}/users/{USERNAME}/goals/{goal}/datapoints/{dp_id}.json"
     data = {"auth_token": AUTH_TOKEN, "value": value, "comment": comment}
     if daystamp:
         data["daystamp"] = daystamp
-    resp = requests.put(url, data=data, timeout=30)
+    resp = SESSION.put(url, data=data, timeout=30)
     try:
         resp.raise_for_status()
     except requests.HTTPError as e:
@@ -210,56 +379,132 @@ def delete_datapoint(goal: str, dp_id: str):
     if DRY_RUN:
         log_debug(f"[DRY_RUN] Would DELETE {goal} dp_id={dp_id}")
         return True
+    _dp_cache.pop((USERNAME, goal), None)
     url = f"{API_BASE}/users/{USERNAME}/goals/{goal}/datapoints/{dp_id}.json"
     params = {"auth_token": AUTH_TOKEN}
-    resp = requests.delete(url, params=params, timeout=30)
+    resp = SESSION.delete(url, params=params, timeout=30)
     try:
         resp.raise_for_status()
     except requests.HTTPError as e:
         raise RuntimeError(f"DELETE {goal} {dp_id} -> {resp.status_code}: {resp.text}") from e
     return True
 
-# -------- SoT compute over a date range --------
-def daterange(start: date, end: date):
-    """Inclusive range of dates from start to end."""
-    cur = start
-    while cur <= end:
-        yield cur
-        cur = cur + timedelta(days=1)
+# -------- Datapoint cache across runs --------
+def _max_updated_at(dps: list[dict]) -> Optional[int]:
+    """Newest updated_at (unix seconds) among dps, or None if none carry one."""
+    best = None
+    for dp in dps:
+        u = dp.get("updated_at")
+        if isinstance(u, str):
+            u = _iso_to_epoch(u)
+        if isinstance(u, (int, float)) and (best is None or u > best):
+            best = u
+    return int(best) if best is not None else None
+
+def dp_cache_path(goal: str) -> Path:
+    return DATA_DIR / f"{goal}_cache.json"
+
+def _read_dp_cache(username: str, goal: str) -> Optional[dict]:
+    """The cached dps for (username, goal), or None if there is no usable
+    cache. A cache written for another user is ignored."""
+    path = dp_cache_path(goal)
+    try:
+        with path.open(encoding="utf-8") as f:
+            cache = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        log_debug(f"Ignoring unreadable {path}: {e}")
+        return None
+    if not isinstance(cache, dict) or not isinstance(cache.get("dps"), list):
+        return None
+    if cache.get("username") != username:
+        log_debug(f"Ignoring {path}: cached for {cache.get('username')!r}, not {username!r}")
+        return None
+    return cache
+
+def _write_dp_cache(username: str, goal: str, dps: list[dict], full_sync_at: str):
+    path = dp_cache_path(goal)
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "username": username,
+                "max_updated_at": _max_updated_at(dps),
+                "full_sync_at": full_sync_at,
+                "dps": dps,
+            },
+            f,
+        )
+    tmp.replace(path)
+
+def fetch_datapoints_cached(username: str, goal: str) -> list[dict]:
+    """All dps for a user's goal, reusing its on-disk cache from earlier runs.
+
+    With a recent cache only dps updated since its newest updated_at are
+    downloaded (one page when nothing changed) and merged in by id;
+    otherwise everything is re-fetched.
+    """
+    if DRY_RUN:
+        return fetch_all_datapoints(username, goal)
+
+    cache = _read_dp_cache(username, goal)
+    since = cache.get("max_updated_at") if cache else None
+    full_sync_at = cache.get("full_sync_at") if cache else None
+    stale = True
+    if since is not None and full_sync_at:
+        last_full = _iso_to_epoch(full_sync_at)
+        stale = last_full is None or (
+            datetime.now(UTC).timestamp() - last_full >= DP_CACHE_MAX_AGE.total_seconds()
+        )
+
+    if stale:
+        dps = fetch_all_datapoints(username, goal)
+        full_sync_at = now_iso_utc()
+    else:
+        fresh = fetch_all_datapoints(username, goal, since=since)
+        merged = {dp.get("id"): dp for dp in cache["dps"]}
+        merged.update((dp.get("id"), dp) for dp in fresh)
+        dps = list(merged.values())
+        log_debug(f"Merged {len(fresh)} updated {goal} dps into {len(cache['dps'])} cached")
 
+    _write_dp_cache(username, goal, dps, full_sync_at)
+    return dps
+
+# -------- SoT compute over a date range --------
 def compute_sot_for_range(
-    focusmate_dps: list[dict], start_date: date, end_date: date
+    focusmate_dps: Iterable[dict], start_date: date, end_date: date
 ) -> dict[str, int]:
-    """Return {daystamp: 1} for days with a qualifying Focusmate session."""
-    # Bucket focusmate dps by daystamp (local)
-    by_day: dict[str, list[dict]] = defaultdict(list)
+    """Return {daystamp: 1} for days with a qualifying Focusmate session.
+
+    `focusmate_dps` is consumed once, so a generator works; keys are in
+    ascending date order.
+    """
+    # YYYYMMDD strings compare in date order, so the range check is a
+    # plain string comparison.
+    start_ds = date_to_daystamp(start_date)
+    end_ds = date_to_daystamp(end_date)
+    qualifying: set[str] = set()
+    parse = parse_comment_for_length_and_time
     for dp in focusmate_dps:
-        ds = dp.get("daystamp")
-        if not ds:
-            ts = dp.get("timestamp")
-            if ts is None:
-                continue
-            ds = daystamp_of(datetime.fromtimestamp(ts, tz=timezone.utc), LOCAL_TZ)
-        by_day[ds].append(dp)
-
-    out: dict[str, int] = {}
-    for d in daterange(start_date, end_date):
-        ds = d.strftime("%Y%m%d")
-        for dp in by_day.get(ds, []):
-            parsed = parse_comment_for_length_and_time(dp.get("comment", ""))
-            if not parsed:
-                continue
-            minutes, hour, minute = parsed
-            if minutes >= MIN_SESSION_MINUTES and qualifies_time(hour, minute):
-                out[ds] = 1
-                break
-    return out
+        ds = _dp_daystamp(dp)
+        # A day that already qualifies needs no more regex work
+        if ds is None or ds in qualifying or not (start_ds <= ds <= end_ds):
+            continue
+        parsed = parse(dp.get("comment"))
+        if parsed and parsed[0] >= MIN_SESSION_MINUTES and parsed[1] * 60 + parsed[2] in QUALIFIES:
+            qualifying.add(ds)
+    return {ds: 1 for ds in sorted(qualifying)}
 
 # -------- SQLite helpers --------
 def sot_open():
     conn = sqlite3.connect(DB_PATH)
     conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    conn.execute("PRAGMA cache_size=-20000;")  # ~20MB, enough to hold the whole SoT
     conn.execute(CREATE_SOT_SQL)
+    conn.execute(CREATE_META_SQL)
     conn.commit()
     return conn
 
@@ -274,31 +519,119 @@ def sot_replace_all(conn: sqlite3.Connection, mapping: dict[str, int]):
             conn.executemany(
                 "DELETE FROM records WHERE daystamp=?", [(ds,) for ds in to_delete]
             )
-        for ds in keys:
-            conn.execute(UPSERT_SOT_SQL, (ds, 1, now))
+        conn.executemany(UPSERT_SOT_SQL, [(ds, 1, now) for ds in keys])
 
 def sot_load_all(conn: sqlite3.Connection) -> dict[str, int]:
-    cur = conn.execute(SELECT_ALL_SOT_SQL)
-    return {row[0]: int(row[1]) for row in cur.fetchall()}
+    # value is INTEGER already; dict() consumes the cursor's 2-tuples directly
+    return dict(conn.execute(SELECT_ALL_SOT_SQL))
+
+def meta_get(conn: sqlite3.Connection, key: str) -> Optional[str]:
+    row = conn.execute("SELECT value FROM meta WHERE key=?", (key,)).fetchone()
+    return row[0] if row else None
+
+def sot_hash(sot_map: dict[str, int]) -> str:
+    """Fingerprint of what reconcile_history would enforce."""
+    # STRICT_PURGE changes what a reconcile does, so it is part of the hash
+    return hashlib.sha1(repr((STRICT_PURGE, sorted(sot_map.items()))).encode()).hexdigest()
+
+def reconcile_is_fresh(conn: sqlite3.Connection, h: str) -> bool:
+    """True if the same SoT was reconciled within RECONCILE_MAX_AGE."""
+    if meta_get(conn, "last_sot_hash") != h:
+        return False
+    last = meta_get(conn, "last_reconcile_at")
+    if not last:
+        return False
+    last_ts = _iso_to_epoch(last)
+    if last_ts is None:
+        return False
+    return datetime.now(UTC).timestamp() - last_ts < RECONCILE_MAX_AGE.total_seconds()
+
+def wakeandfocus_edited_since_reconcile(conn: sqlite3.Connection) -> bool:
+    """True if any wakeandfocus dp was updated after the last reconcile.
+
+    One GET with updated_since; dps are also filtered client-side, so this
+    stays correct if the API returns unfiltered dps. Deletions made on
+    Beeminder are not visible this way and wait for the next full
+    reconcile (at most RECONCILE_MAX_AGE later).
+    """
+    last_ts = _iso_to_epoch(meta_get(conn, "last_reconcile_at") or "")
+    if last_ts is None:
+        return True
+    if DRY_RUN:
+        return False
+    _need_auth()
+    _, batch = _fetch_page(USERNAME, WAKEANDFOCUS_GOAL, 1, 25, int(last_ts))
+    newest = _max_updated_at(batch)
+    return newest is not None and newest > last_ts
 
 # -------- Reconciliation across history --------
-def reconcile_history(sot_map: dict[str, int]):
-    """Bring wakeandfocus dps in line with SoT for all days in sot_map."""
+def _run_parallel(
+    pool: ThreadPoolExecutor, tasks: list[tuple[str, str, Callable[[], object]]]
+) -> list[tuple[str, str]]:
+    """Run independent API calls on pool; return (daystamp, error) per failure."""
+    errors: list[tuple[str, str]] = []
+    futures = {pool.submit(fn): (label, ds) for label, ds, fn in tasks}
+    for fut in as_completed(futures):
+        label, ds = futures[fut]
+        try:
+            fut.result()
+        except Exception as e:
+            errors.append((ds, f"{label}: {e}"))
+    return errors
+
+def reconcile_history(sot_map: dict[str, int], conn: sqlite3.Connection):
+    """Bring wakeandfocus dps in line with SoT for all days in sot_map.
+
+    The outcome (call counts, SoT hash, time) is written to meta in one
+    IMMEDIATE transaction on conn, so it lands atomically; the write lock is
+    held for the whole API fan-out. Nothing is recorded if the purge was
+    aborted, so the next run tries again instead of skipping.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        counts, aborted = _reconcile_with_beeminder(sot_map)
+        if aborted:
+            log_debug("STRICT_PURGE aborted; not recording this reconcile")
+        elif not DRY_RUN:
+            now = now_iso_utc()
+            conn.executemany(UPSERT_META_SQL, [
+                ("last_sot_hash", sot_hash(sot_map)),
+                ("last_reconcile_at", now),
+                ("last_reconcile_counts", json.dumps(counts, sort_keys=True)),
+            ])
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+def _reconcile_with_beeminder(sot_map: dict[str, int]) -> tuple[dict[str, int], bool]:
+    """Issue the API calls for reconcile_history; return (counts per method,
+    whether the STRICT_PURGE mass-deletion guard aborted the purge)."""
+    # Always a full fetch: an updated_since fetch can't see dps deleted on
+    # Beeminder, and this goal is small (about one dp per day).
     wf_all = fetch_all_datapoints(USERNAME, WAKEANDFOCUS_GOAL)
 
-    # Group existing wakeandfocus by daystamp
-    wf_by_day: dict[str, list[dict]] = defaultdict(list)
-    for dp in wf_all:
-        ds = dp.get("daystamp")
-        if not ds:
-            ts = dp.get("timestamp")
-            if ts is None:
-                continue
-            ds = daystamp_of(datetime.fromtimestamp(ts, tz=timezone.utc), LOCAL_TZ)
-        wf_by_day[ds].append(dp)
+    # The same dp can show up twice (e.g. pages shifting between requests);
+    # left in, it would be planned for deletion against itself.
+    wf_unique = _dedupe_by_id(wf_all)
+    if len(wf_unique) != len(wf_all):
+        log_debug(f"Dropped {len(wf_all) - len(wf_unique)} repeated wakeandfocus dp(s)")
 
-    # 1) For each SoT day: ensure exactly one dp with matching value+comment
-    for ds, sot_val in sorted(sot_map.items()):
+    # Group existing wakeandfocus by daystamp
+    wf_by_day = _bucket_by_daystamp(wf_unique, sot_map)
+
+    # 1) For each SoT day: plan the calls that leave exactly one dp with
+    #    matching value+comment. Nothing is sent until the plan is complete.
+    #    POSTs and DELETEs go out in a first wave; keeper PUTs follow once
+    #    their day's duplicate deletes are done.
+    calls: list[tuple[str, str, Callable[[], object]]] = []
+    puts: list[tuple[str, str, Callable[[], object]]] = []
+    in_sync = 0
+    # compute_sot_for_range builds sot_map in ascending daystamp order, so
+    # plain dict iteration is already chronological.
+    if DEBUG:
+        assert list(sot_map) == sorted(sot_map), "sot_map is not in daystamp order"
+    for ds, sot_val in sot_map.items():
         comment_ok = f"Auto: SoT={int(sot_val)} for {ds} (≥50m by 09:15 check)."
         existing = sorted(
             wf_by_day.get(ds, []),
@@ -309,17 +642,23 @@ def reconcile_history(sot_map: dict[str, int]):
         if not existing:
             reqid = f"{WAKEANDFOCUS_GOAL}-{ds}-sot-v1"
             log_debug(f"[{ds}] Missing on Beeminder → POST {int(sot_val)}")
-            add_datapoint(WAKEANDFOCUS_GOAL, int(sot_val), comment_ok, daystamp=ds, requestid=reqid)
+            calls.append((
+                f"POST {ds}",
+                ds,
+                partial(add_datapoint, WAKEANDFOCUS_GOAL, int(sot_val), comment_ok, daystamp=ds, requestid=reqid),
+            ))
             continue
 
         keeper = existing[0]
         extras = existing[1:]
+        day_in_sync = True
         # delete extras
         for dp in extras:
             dp_id = dp.get("id")
             if dp_id:
                 log_debug(f"[{ds}] Deleting duplicate dp {dp_id}")
-                delete_datapoint(WAKEANDFOCUS_GOAL, dp_id)
+                calls.append((f"DELETE {ds} {dp_id}", ds, partial(delete_datapoint, WAKEANDFOCUS_GOAL, dp_id)))
+                day_in_sync = False
 
         # ensure keeper matches SoT
         try:
@@ -334,9 +673,20 @@ def reconcile_history(sot_map: dict[str, int]):
             kp_id = keeper.get("id")
             if kp_id:
                 log_debug(f"[{ds}] Updating keeper {kp_id} -> {int(sot_val)}")
-                update_datapoint(WAKEANDFOCUS_GOAL, kp_id, int(sot_val), comment_ok, daystamp=ds)
+                puts.append((
+                    f"PUT {ds} {kp_id}",
+                    ds,
+                    partial(update_datapoint, WAKEANDFOCUS_GOAL, kp_id, int(sot_val), comment_ok, daystamp=ds),
+                ))
+                day_in_sync = False
+
+        if day_in_sync:
+            in_sync += 1
+
+    log_debug(f"{in_sync} SoT day(s) already in sync")
 
     # 2) Optional purge: remove wakeandfocus dps on days not in SoT
+    aborted = False
     if STRICT_PURGE:
         sot_days = set(sot_map.keys())
         # Count deletions first for safety
@@ -350,16 +700,38 @@ def reconcile_history(sot_map: dict[str, int]):
             print("This seems like a lot. Consider running with STRICT_PURGE=0 first.")
             if not DRY_RUN:
                 print("Aborting to prevent accidental mass deletion.")
-                return
-
-        log_debug(f"STRICT_PURGE: deleting {deletion_count} datapoints not in SoT")
-        for ds, dps in wf_by_day.items():
-            if ds not in sot_days:
-                for dp in dps:
-                    dp_id = dp.get("id")
-                    if dp_id:
-                        log_debug(f"[{ds}] STRICT_PURGE delete dp {dp_id}")
-                        delete_datapoint(WAKEANDFOCUS_GOAL, dp_id)
+                aborted = True
+
+        if not aborted:
+            log_debug(f"STRICT_PURGE: deleting {deletion_count} datapoints not in SoT")
+            for ds, dps in wf_by_day.items():
+                if ds not in sot_days:
+                    for dp in dps:
+                        dp_id = dp.get("id")
+                        if dp_id:
+                            log_debug(f"[{ds}] STRICT_PURGE delete dp {dp_id}")
+                            calls.append((
+                                f"STRICT_PURGE {ds} {dp_id}",
+                                ds,
+                                partial(delete_datapoint, WAKEANDFOCUS_GOAL, dp_id),
+                            ))
+
+    n_post = sum(1 for label, _, _ in calls if label.startswith("POST"))
+    counts = {"POST": n_post, "DELETE": len(calls) - n_post, "PUT": 0}
+    if not calls and not puts:
+        return counts, aborted
+    with ThreadPoolExecutor(max_workers=RECONCILE_WORKERS) as pool:
+        errors = _run_parallel(pool, calls)
+        failed_days = {ds for ds, _ in errors}
+        runnable = [t for t in puts if t[1] not in failed_days]
+        if len(runnable) != len(puts):
+            log_debug(f"Skipping {len(puts) - len(runnable)} PUT(s) on days whose deletes failed")
+        errors += _run_parallel(pool, runnable)
+    log_debug(f"Ran {len(calls) + len(runnable)} reconcile call(s), {len(errors)} failed")
+    if errors:
+        raise RuntimeError(f"{len(errors)} reconcile call(s) failed; first: {errors[0][1]}")
+    counts["PUT"] = len(runnable)
+    return counts, aborted
 
 # -------- Main --------
 def main():
@@ -367,22 +739,24 @@ def main():
         # Determine range
         end_date = datetime.now(LOCAL_TZ).date()
         if FULL_HISTORY:
-            fm_all = fetch_all_datapoints(USERNAME, FOCUSMATE_GOAL)
-            timestamps = [
-                dp.get("timestamp")
-                for dp in fm_all
-                if isinstance(dp.get("timestamp"), (int, float))
-            ]
-            if timestamps:
-                earliest_ts = min(timestamps)
-                start_date = datetime.fromtimestamp(earliest_ts, tz=timezone.utc).astimezone(LOCAL_TZ).date()
+            fm_all = fetch_datapoints_cached(USERNAME, FOCUSMATE_GOAL)
+            earliest_ts = min(
+                (
+                    dp["timestamp"]
+                    for dp in fm_all
+                    if isinstance(dp.get("timestamp"), (int, float))
+                ),
+                default=None,
+            )
+            if earliest_ts is not None:
+                start_date = datetime.fromtimestamp(earliest_ts, tz=UTC).astimezone(LOCAL_TZ).date()
             else:
                 start_date = end_date
             log_debug(f"Range FULL_HISTORY: {start_date} .. {end_date}")
         else:
             start_date = end_date - timedelta(days=HISTORY_DAYS - 1)
             log_debug(f"Range LAST {HISTORY_DAYS} DAYS: {start_date} .. {end_date}")
-            fm_all = fetch_all_datapoints(USERNAME, FOCUSMATE_GOAL)
+            fm_all = fetch_datapoints_cached(USERNAME, FOCUSMATE_GOAL)
 
         # Build SoT over the chosen range
         sot_map = compute_sot_for_range(fm_all, start_date, end_date)
@@ -391,8 +765,13 @@ def main():
         conn = sot_open()
         sot_replace_all(conn, sot_map)
 
-        # Reconcile across history
-        reconcile_history(sot_map)
+        # Reconcile across history, unless this exact SoT was just reconciled
+        # and nobody has edited wakeandfocus since
+        h = sot_hash(sot_map)
+        if reconcile_is_fresh(conn, h) and not wakeandfocus_edited_since_reconcile(conn):
+            log_debug(f"SoT unchanged (hash {h[:12]}) and recently reconciled; skipping")
+        else:
+            reconcile_history(sot_map, conn)
 
     except requests.HTTPError as e:
         # Should rarely hit now because we catch/raise with body above
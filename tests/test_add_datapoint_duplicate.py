@@ -24,7 +24,7 @@ def test_add_datapoint_duplicate(monkeypatch):
     def fake_post(url, data, timeout):
         return DummyResponse()
 
-    monkeypatch.setattr(requests, "post", fake_post)
+    monkeypatch.setattr(wf.SESSION, "post", fake_post)
     wf.DRY_RUN = False
     wf.AUTH_TOKEN = "token"
     wf.USERNAME = "user"
@@ -0,0 +1,23 @@
+import importlib.util
+from datetime import date
+from pathlib import Path
+
+# Load module like other tests
+spec = importlib.util.spec_from_file_location(
+    "wake_focus_sync", Path(__file__).resolve().parents[1] / "scripts" / "wake_focus_sync.py"
+)
+wf = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(wf)
+
+
+def test_compute_sot_for_range_from_generator():
+    dps = [
+        {"daystamp": "20250103", "comment": "50 minutes session at 10:00"},  # too late
+        {"daystamp": "20250103", "comment": "50 minutes session at 7:30"},
+        {"daystamp": "20250102", "comment": "10 minutes session at 7:30"},  # too short
+        {"daystamp": "20250101", "comment": "no session here"},
+        {"daystamp": "20241231", "comment": "50 minutes session at 7:30"},  # out of range
+        {"timestamp": 1735992000, "comment": "50 minutes session at 7:00"},  # 20250104 NY
+    ]
+    sot = wf.compute_sot_for_range(iter(dps), date(2025, 1, 1), date(2025, 1, 4))
+    assert list(sot.items()) == [("20250103", 1), ("20250104", 1)]
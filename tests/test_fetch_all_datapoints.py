@@ -0,0 +1,98 @@
+import importlib.util
+from pathlib import Path
+
+# Load module like other tests
+spec = importlib.util.spec_from_file_location(
+    "wake_focus_sync", Path(__file__).resolve().parents[1] / "scripts" / "wake_focus_sync.py"
+)
+wf = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(wf)
+
+
+def test_fetch_all_datapoints_stops_at_short_page(monkeypatch):
+    # 2 full pages + 1 short page; anything prefetched beyond it is dropped
+    pages = {1: 25, 2: 25, 3: 7, 4: 25, 5: 25}
+
+    class DummyResponse:
+        status_code = 200
+        text = ""
+
+        def __init__(self, page):
+            self.page = page
+
+        def json(self):
+            return [{"id": f"{self.page}-{i}"} for i in range(pages.get(self.page, 0))]
+
+        def raise_for_status(self):
+            pass
+
+    def fake_get(url, params, timeout):
+        return DummyResponse(params["page"])
+
+    monkeypatch.setattr(wf.SESSION, "get", fake_get)
+    monkeypatch.setattr(wf, "DRY_RUN", False)
+    monkeypatch.setattr(wf, "AUTH_TOKEN", "token")
+    monkeypatch.setattr(wf, "_dp_cache", {})
+
+    result = wf.fetch_all_datapoints("user", "goal")
+    assert len(result) == 57
+    assert result[0]["id"] == "1-0"
+    assert result[-1]["id"] == "3-6"
+
+
+def test_fetch_all_datapoints_single_short_page_is_one_request(monkeypatch):
+    requested = []
+
+    class DummyResponse:
+        status_code = 200
+        text = ""
+
+        def json(self):
+            return [{"id": "1-0"}]
+
+        def raise_for_status(self):
+            pass
+
+    def fake_get(url, params, timeout):
+        requested.append((params["page"], params.get("updated_since")))
+        return DummyResponse()
+
+    monkeypatch.setattr(wf.SESSION, "get", fake_get)
+    monkeypatch.setattr(wf, "DRY_RUN", False)
+    monkeypatch.setattr(wf, "AUTH_TOKEN", "token")
+    monkeypatch.setattr(wf, "_dp_cache", {})
+
+    assert len(wf.fetch_all_datapoints("user", "goal")) == 1
+    assert len(wf.fetch_all_datapoints("user", "goal", since=100)) == 1
+    assert requested == [(1, None), (1, 100)]
+
+
+def test_fetch_all_datapoints_since_pages_serially(monkeypatch):
+    # With since set, pages are fetched one at a time and never past the short one
+    pages = {1: 25, 2: 25, 3: 3, 4: 25}
+    requested = []
+
+    class DummyResponse:
+        status_code = 200
+        text = ""
+
+        def __init__(self, page):
+            self.page = page
+
+        def json(self):
+            return [{"id": f"{self.page}-{i}"} for i in range(pages.get(self.page, 0))]
+
+        def raise_for_status(self):
+            pass
+
+    def fake_get(url, params, timeout):
+        requested.append(params["page"])
+        return DummyResponse(params["page"])
+
+    monkeypatch.setattr(wf.SESSION, "get", fake_get)
+    monkeypatch.setattr(wf, "DRY_RUN", False)
+    monkeypatch.setattr(wf, "AUTH_TOKEN", "token")
+    monkeypatch.setattr(wf, "_dp_cache", {})
+
+    assert len(wf.fetch_all_datapoints("user", "goal", since=100)) == 53
+    assert requested == [1, 2, 3]
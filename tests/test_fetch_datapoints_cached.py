@@ -0,0 +1,62 @@
+import importlib.util
+import json
+from pathlib import Path
+
+# Load module like other tests
+spec = importlib.util.spec_from_file_location(
+    "wake_focus_sync", Path(__file__).resolve().parents[1] / "scripts" / "wake_focus_sync.py"
+)
+wf = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(wf)
+
+
+def test_fetch_datapoints_cached_merges_updates(monkeypatch, tmp_path):
+    cache_path = tmp_path / "goal_cache.json"
+    cache_path.write_text(json.dumps({
+        "username": "user",
+        "max_updated_at": 100,
+        "full_sync_at": wf.now_iso_utc(),
+        "dps": [
+            {"id": "a", "comment": "old", "updated_at": 90},
+            {"id": "b", "comment": "kept", "updated_at": 100},
+        ],
+    }))
+    seen = {}
+
+    def fake_fetch(username, goal, since=None):
+        seen["since"] = since
+        return [{"id": "a", "comment": "new", "updated_at": 150}, {"id": "c", "updated_at": 120}]
+
+    monkeypatch.setattr(wf, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(wf, "fetch_all_datapoints", fake_fetch)
+    monkeypatch.setattr(wf, "DRY_RUN", False)
+
+    dps = wf.fetch_datapoints_cached("user", "goal")
+    assert seen["since"] == 100
+    assert {dp["id"]: dp.get("comment") for dp in dps} == {"a": "new", "b": "kept", "c": None}
+    assert json.loads(cache_path.read_text())["max_updated_at"] == 150
+
+
+def test_fetch_datapoints_cached_ignores_other_users_cache(monkeypatch, tmp_path):
+    cache_path = tmp_path / "goal_cache.json"
+    cache_path.write_text(json.dumps({
+        "username": "alice",
+        "max_updated_at": 100,
+        "full_sync_at": wf.now_iso_utc(),
+        "dps": [{"id": "a1", "updated_at": 100}],
+    }))
+    seen = {}
+
+    def fake_fetch(username, goal, since=None):
+        seen["since"] = since
+        return [{"id": "b1", "updated_at": 50}]
+
+    monkeypatch.setattr(wf, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(wf, "fetch_all_datapoints", fake_fetch)
+    monkeypatch.setattr(wf, "DRY_RUN", False)
+
+    # bob must get a full fetch of his own dps, never alice's cached ones
+    dps = wf.fetch_datapoints_cached("bob", "goal")
+    assert seen["since"] is None
+    assert [dp["id"] for dp in dps] == ["b1"]
+    assert json.loads(cache_path.read_text())["username"] == "bob"
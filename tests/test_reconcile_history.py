@@ -0,0 +1,90 @@
+import importlib.util
+import sqlite3
+from pathlib import Path
+
+# Load module like other tests
+spec = importlib.util.spec_from_file_location(
+    "wake_focus_sync", Path(__file__).resolve().parents[1] / "scripts" / "wake_focus_sync.py"
+)
+wf = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(wf)
+
+
+def test_reconcile_history_ignores_repeated_dps(monkeypatch):
+    ok = "Auto: SoT=1 for 20250101 (≥50m by 09:15 check)."
+    dp = {"id": "a", "daystamp": "20250101", "value": 1, "comment": ok}
+    calls = []
+
+    monkeypatch.setattr(wf, "fetch_all_datapoints", lambda *a, **k: [dp, dict(dp)])
+    monkeypatch.setattr(wf, "add_datapoint", lambda *a, **k: calls.append(("POST", a)))
+    monkeypatch.setattr(wf, "update_datapoint", lambda *a, **k: calls.append(("PUT", a)))
+    monkeypatch.setattr(wf, "delete_datapoint", lambda *a, **k: calls.append(("DELETE", a)))
+
+    monkeypatch.setattr(wf, "DRY_RUN", False)
+    conn = sqlite3.connect(":memory:")
+    conn.execute(wf.CREATE_META_SQL)
+
+    # The same dp listed twice must not be deleted as its own duplicate
+    wf.reconcile_history({"20250101": 1}, conn)
+    assert calls == []
+    assert wf.meta_get(conn, "last_sot_hash") == wf.sot_hash({"20250101": 1})
+
+
+def test_reconcile_history_skips_put_when_days_delete_fails(monkeypatch):
+    def dp(dp_id, ds, updated_at):
+        return {"id": dp_id, "daystamp": ds, "value": 0, "comment": "stale", "updated_at": updated_at}
+
+    dps = [
+        dp("keep1", "20250101", "2025-01-02T00:00:00Z"),
+        dp("dup1", "20250101", "2025-01-01T00:00:00Z"),
+        dp("keep2", "20250102", "2025-01-03T00:00:00Z"),
+        dp("dup2", "20250102", "2025-01-01T00:00:00Z"),
+    ]
+    calls = []
+
+    def fake_delete(goal, dp_id):
+        calls.append(("DELETE", dp_id))
+        if dp_id == "dup1":
+            raise RuntimeError("boom")
+
+    monkeypatch.setattr(wf, "fetch_all_datapoints", lambda *a, **k: dps)
+    monkeypatch.setattr(wf, "add_datapoint", lambda *a, **k: calls.append(("POST", a[0])))
+    monkeypatch.setattr(wf, "update_datapoint", lambda goal, dp_id, *a, **k: calls.append(("PUT", dp_id)))
+    monkeypatch.setattr(wf, "delete_datapoint", fake_delete)
+
+    monkeypatch.setattr(wf, "DRY_RUN", False)
+    conn = sqlite3.connect(":memory:")
+    conn.execute(wf.CREATE_META_SQL)
+
+    try:
+        wf.reconcile_history({"20250101": 1, "20250102": 1}, conn)
+    except RuntimeError as e:
+        assert "dup1" in str(e)
+    else:
+        raise AssertionError("expected the failed DELETE to be raised")
+
+    # Both deletes ran in the first wave; only the healthy day's PUT followed
+    assert sorted(calls[:2]) == [("DELETE", "dup1"), ("DELETE", "dup2")]
+    assert calls[2:] == [("PUT", "keep2")]
+    assert wf.meta_get(conn, "last_sot_hash") is None
+
+
+def test_reconcile_history_not_recorded_when_purge_aborted(monkeypatch):
+    # 11 dps outside the SoT trips the STRICT_PURGE mass-deletion guard
+    dps = [{"id": f"x{i}", "daystamp": f"202402{i + 10:02d}", "value": 1} for i in range(11)]
+    calls = []
+
+    monkeypatch.setattr(wf, "fetch_all_datapoints", lambda *a, **k: dps)
+    monkeypatch.setattr(wf, "add_datapoint", lambda *a, **k: calls.append(("POST", k["daystamp"])))
+    monkeypatch.setattr(wf, "update_datapoint", lambda *a, **k: calls.append(("PUT", a)))
+    monkeypatch.setattr(wf, "delete_datapoint", lambda *a, **k: calls.append(("DELETE", a)))
+
+    monkeypatch.setattr(wf, "DRY_RUN", False)
+    monkeypatch.setattr(wf, "STRICT_PURGE", True)
+    conn = sqlite3.connect(":memory:")
+    conn.execute(wf.CREATE_META_SQL)
+
+    wf.reconcile_history({"20250101": 1}, conn)
+    assert calls == [("POST", "20250101")]
+    assert wf.meta_get(conn, "last_sot_hash") is None
+    assert wf.meta_get(conn, "last_reconcile_at") is None
@@ -0,0 +1,60 @@
+import importlib.util
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Load module like other tests
+spec = importlib.util.spec_from_file_location(
+    "wake_focus_sync", Path(__file__).resolve().parents[1] / "scripts" / "wake_focus_sync.py"
+)
+wf = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(wf)
+
+
+def _conn(sot_hash, reconciled_at):
+    conn = sqlite3.connect(":memory:")
+    conn.execute(wf.CREATE_META_SQL)
+    conn.executemany(wf.UPSERT_META_SQL, [
+        ("last_sot_hash", sot_hash),
+        ("last_reconcile_at", reconciled_at.strftime("%Y-%m-%dT%H:%M:%SZ")),
+    ])
+    return conn
+
+
+def test_reconcile_is_fresh(monkeypatch):
+    sot_map = {"20250101": 1}
+    monkeypatch.setattr(wf, "STRICT_PURGE", False)
+    h = wf.sot_hash(sot_map)
+    now = datetime.now(timezone.utc)
+
+    # Same hash, reconciled under 24h ago -> skip
+    assert wf.reconcile_is_fresh(_conn(h, now - timedelta(hours=23)), h)
+    # Different SoT -> reconcile
+    assert not wf.reconcile_is_fresh(_conn(h, now), wf.sot_hash({"20250102": 1}))
+    # Old reconcile -> reconcile
+    assert not wf.reconcile_is_fresh(_conn(h, now - timedelta(hours=25)), h)
+
+    # Turning STRICT_PURGE on changes the hash -> reconcile
+    monkeypatch.setattr(wf, "STRICT_PURGE", True)
+    assert not wf.reconcile_is_fresh(_conn(h, now), wf.sot_hash(sot_map))
+
+
+def test_wakeandfocus_edited_since_reconcile(monkeypatch):
+    reconciled_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    last_ts = int(reconciled_at.replace(microsecond=0).timestamp())
+    pages = []
+
+    def fake_fetch_page(username, goal, page, per_page, since=None):
+        assert since == last_ts
+        return page, pages
+
+    monkeypatch.setattr(wf, "_fetch_page", fake_fetch_page)
+    monkeypatch.setattr(wf, "DRY_RUN", False)
+    monkeypatch.setattr(wf, "AUTH_TOKEN", "token")
+    conn = _conn("h", reconciled_at)
+
+    assert not wf.wakeandfocus_edited_since_reconcile(conn)
+    pages[:] = [{"id": "a", "updated_at": last_ts - 60}]  # our own earlier write
+    assert not wf.wakeandfocus_edited_since_reconcile(conn)
+    pages[:] = [{"id": "a", "updated_at": last_ts + 60}]  # edited by hand since
+    assert wf.wakeandfocus_edited_since_reconcile(conn)